@@ -18,18 +18,39 @@ log = logging.getLogger(__name__) # pylint: disable=invalid-name
 log.addHandler(logging.NullHandler())
 
 # Constants
+FETCH_BATCH_SIZE = 4096
 
 # Functions
+def _run_loop(cpu, debugger):
+    """ The tight fetch/poll loop, runs until an exception stops it.
+
+    Kept as a module-level function so everything the loop touches is a
+    LOAD_FAST local; PyPy's JIT traces and specializes this shape much better
+    than a loop buried in a method working off self.
+    """
+    fetch = cpu.fetch
+    fetch_n = cpu.fetch_n
+    poll = debugger.poll
+    while True:
+        # Only pay the per-instruction poll when the debugger is
+        # watching; otherwise run instructions in batches.
+        if debugger.active:
+            poll()
+            fetch()
+        else:
+            fetch_n(FETCH_BATCH_SIZE)
 
 # Classes
 class Console(object):
     """ Main console object containing all other components. """
     def __init__(self, filepath):
-        self.cpu = Cpu65c816(self)
         self.rom = RomImage(filepath)
         assert self.rom.type == RomType.LO_ROM, "This is all we've got for now!"
         self.mem = LoRomMemoryMap(self.rom.data)
-        
+
+        # Must be after MEM so the CPU can cache a reference to it.
+        self.cpu = Cpu65c816(self)
+
         # Must be after CPU and MEM.
         self.debugger = Debugger(self)
         
@@ -40,10 +61,8 @@ class Console(object):
         
         cpu.regs.PC = self.mem.read_word(0x00, 0xFFFC)
         try:
-            while True:
-                debugger.poll()
-                cpu.fetch()
-                
+            _run_loop(cpu, debugger)
+
         except Exception:
             debugger.dump_regs()
             log.exception("Unhandled exception at PBR:PB %02x:%04x", cpu.regs.PBR, cpu.regs.PC)
@@ -55,5 +74,5 @@ class Console(object):
     def control_c_handler(self, _signum, _frame):
         """ Control-C handler to enter single-step mode. """
         log.warning("Control-C")
-        self.debugger.single_step = True
+        self.debugger.request_break()
         
\ No newline at end of file
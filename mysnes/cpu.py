@@ -8,8 +8,9 @@ http://www.defence-force.org/computing/oric/coding/annexe_2/index.htm
 """
 
 # Standard library imports
-import struct
-from ctypes import Structure, Union, c_ushort, c_ubyte
+
+# Local imports
+from .mem import LOW_RAM_SIZE
 
 # Logging setup
 import logging
@@ -19,92 +20,166 @@ log.addHandler(logging.NullHandler())
 # Constants
 
 # Functions
-SIGNED_BYTE = struct.Struct("<b")
-UNSIGNED_BYTE = struct.Struct("<B")
 def signed_byte(value):
     """ Interpret an unsigned byte as a signed byte. """
-    return SIGNED_BYTE.unpack(UNSIGNED_BYTE.pack(value))[0]
-    
+    return value - 0x100 if value & 0x80 else value
+
+def _flag_property(mask, doc):
+    """ Build a boolean property backed by one bit of the packed P byte. """
+    def getter(self):
+        return bool(self._p & mask)
+    def setter(self, value):
+        if value:
+            self._p |= mask
+        else:
+            self._p &= ~mask & 0xFF
+    return property(getter, setter, doc=doc)
+
 # Classes
-class ByteRegisters(Structure):
-    """ Structure for byte access to registers. """
-    _fields_ = [
-        ("A", c_ubyte),
-        ("B", c_ubyte),
-        ("XL", c_ubyte),
-        ("XH", c_ubyte),
-        ("YL", c_ubyte),
-        ("YH", c_ubyte),
-        ("SPL", c_ubyte),
-        ("SPH", c_ubyte),
-        ("DPL", c_ubyte),
-        ("DPH", c_ubyte),
-        ("PCL", c_ubyte),
-        ("PCH", c_ubyte),
-        ("PBR", c_ubyte), # Program bank register
-        ("DBR", c_ubyte), # Data bank register
-    ]
-    
-class WordRegisters(Structure):
-    """ Structure for word access to registers. """
-    _fields_ = [
-        ("C", c_ushort), # 16-bit accumulator
-        ("X", c_ushort), # Index X
-        ("Y", c_ushort), # Index Y
-        ("SP", c_ushort), # Stack pointer
-        ("DP", c_ushort), # Direct page register
-        ("PC", c_ushort), # Program counter
-    ]
-    
-class Registers(Union):
-    """ Union for byte/word access to registers. """
-    _anonymous_ = ("byte", "word")
-    _fields_ = [
-        ("byte", ByteRegisters),
-        ("word", WordRegisters),
-    ]
-    
+class Registers(object):
+    """ Register file held as plain Python ints.
+
+    The previous ctypes Union aliased byte and word views of the registers in
+    C memory, but every access then boxed a c_ubyte/c_ushort into a Python int
+    and ctypes calls block PyPy's tracing JIT.  Plain ints are fast on both
+    interpreters; the 8-bit halves below are mask/shift properties over the
+    word registers, which PyPy specializes away entirely.
+
+    Word registers are stored unmasked, so code that mutates them must mask
+    to 16 bits where wrap-around matters (the old c_ushort wrapped for free).
+    """
+    __slots__ = ("C", "X", "Y", "SP", "DP", "PC", "PBR", "DBR")
+
     def __init__(self):
-        Union.__init__(self)
-        
-        # These are all initialized to zero by ctypes but this is done so PyLint isn't confused.
         # pylint: disable=invalid-name
-        self.A = 0
-        self.B = 0
-        self.C = 0
-        
-        self.XL = 0
-        self.XH = 0
-        self.X = 0
-        
-        self.YL = 0
-        self.YH = 0
-        self.Y = 0
-        
-        self.SPL = 0
-        self.SPH = 0
-        self.SP = 0
-        
-        self.DPL = 0
-        self.DPH = 0
-        self.DP = 0
-        
-        self.PCL = 0
-        self.PCH = 0
-        self.PC = 0
-        
-        self.PBR = 0
-        self.DBR = 0
+        self.C = 0 # 16-bit accumulator
+        self.X = 0 # Index X
+        self.Y = 0 # Index Y
+        self.SP = 0 # Stack pointer
+        self.DP = 0 # Direct page register
+        self.PC = 0 # Program counter
+        self.PBR = 0 # Program bank register
+        self.DBR = 0 # Data bank register
         # pylint: enable=invalid-name
-        
-    def __getitem__(self, key):
-        return getattr(self, key)
-        
-    def __setitem__(self, key, value):
-        setattr(self, key, value)
-        
+
+    # pylint: disable=invalid-name
+    @property
+    def A(self):
+        """ Accumulator, low byte of C. """
+        return self.C & 0xFF
+
+    @A.setter
+    def A(self, value):
+        self.C = (self.C & 0xFF00) | (value & 0xFF)
+
+    @property
+    def B(self):
+        """ Accumulator, high byte of C. """
+        return (self.C >> 8) & 0xFF
+
+    @B.setter
+    def B(self, value):
+        self.C = (self.C & 0x00FF) | ((value & 0xFF) << 8)
+
+    @property
+    def XL(self):
+        """ Index X, low byte. """
+        return self.X & 0xFF
+
+    @XL.setter
+    def XL(self, value):
+        self.X = (self.X & 0xFF00) | (value & 0xFF)
+
+    @property
+    def XH(self):
+        """ Index X, high byte. """
+        return (self.X >> 8) & 0xFF
+
+    @XH.setter
+    def XH(self, value):
+        self.X = (self.X & 0x00FF) | ((value & 0xFF) << 8)
+
+    @property
+    def YL(self):
+        """ Index Y, low byte. """
+        return self.Y & 0xFF
+
+    @YL.setter
+    def YL(self, value):
+        self.Y = (self.Y & 0xFF00) | (value & 0xFF)
+
+    @property
+    def YH(self):
+        """ Index Y, high byte. """
+        return (self.Y >> 8) & 0xFF
+
+    @YH.setter
+    def YH(self, value):
+        self.Y = (self.Y & 0x00FF) | ((value & 0xFF) << 8)
+
+    @property
+    def SPL(self):
+        """ Stack pointer, low byte. """
+        return self.SP & 0xFF
+
+    @SPL.setter
+    def SPL(self, value):
+        self.SP = (self.SP & 0xFF00) | (value & 0xFF)
+
+    @property
+    def SPH(self):
+        """ Stack pointer, high byte. """
+        return (self.SP >> 8) & 0xFF
+
+    @SPH.setter
+    def SPH(self, value):
+        self.SP = (self.SP & 0x00FF) | ((value & 0xFF) << 8)
+
+    @property
+    def DPL(self):
+        """ Direct page register, low byte. """
+        return self.DP & 0xFF
+
+    @DPL.setter
+    def DPL(self, value):
+        self.DP = (self.DP & 0xFF00) | (value & 0xFF)
+
+    @property
+    def DPH(self):
+        """ Direct page register, high byte. """
+        return (self.DP >> 8) & 0xFF
+
+    @DPH.setter
+    def DPH(self, value):
+        self.DP = (self.DP & 0x00FF) | ((value & 0xFF) << 8)
+
+    @property
+    def PCL(self):
+        """ Program counter, low byte. """
+        return self.PC & 0xFF
+
+    @PCL.setter
+    def PCL(self, value):
+        self.PC = (self.PC & 0xFF00) | (value & 0xFF)
+
+    @property
+    def PCH(self):
+        """ Program counter, high byte. """
+        return (self.PC >> 8) & 0xFF
+
+    @PCH.setter
+    def PCH(self, value):
+        self.PC = (self.PC & 0x00FF) | ((value & 0xFF) << 8)
+    # pylint: enable=invalid-name
+
 class ProcessorStatusRegister(object):
-    """ Processor status register "P". """
+    """ Processor status register "P".
+
+    The flags are packed into a single byte (self._p, native-mode layout) so
+    reading .value is one mask instead of rebuilding the byte from seven
+    booleans, and REP/SEP can AND/OR the whole byte just like the hardware.
+    The individual flags remain accessible as boolean properties.
+    """
     CARRY = 0x01
     ZERO = 0x02
     IRQ_DISABLE = 0x04
@@ -113,106 +188,86 @@ class ProcessorStatusRegister(object):
     MEMORY_SELECT = 0x20
     OVERFLOW = 0x40
     NEGATIVE = 0x80
-    
-    ALWAYS_ON_EMULATION = MEMORY_SELECT 
-    
+
+    ALWAYS_ON_EMULATION = MEMORY_SELECT
+
     def __init__(self):
-        self.carry = False
-        self.zero = False
-        self.irq_disable = False
-        self.decimal = False
-        self.index_register_select = False # X (Native only) 1=8-bit 0=16-bit
-        self.memory_select = False # M (Native Only) 1=8-bit 0=16-bit
-        self.break_flag = False # B (Emulation only)
-        self.overflow = False
-        self.negative = False
-        
+        self._p = 0x00
+        self.break_flag = False # B (Emulation only), lives outside _p.
+
         self.emulation = True # Boots into emulation mode.
-        
+
+    carry = _flag_property(CARRY, "Carry flag.")
+    zero = _flag_property(ZERO, "Zero flag.")
+    irq_disable = _flag_property(IRQ_DISABLE, "IRQ disable flag.")
+    decimal = _flag_property(DECIMAL, "Decimal mode flag.")
+    # X (Native only) 1=8-bit 0=16-bit
+    index_register_select = _flag_property(INDEX_REGISTER_SELECT, "Index register select.")
+    # M (Native only) 1=8-bit 0=16-bit
+    memory_select = _flag_property(MEMORY_SELECT, "Memory/accumulator select.")
+    overflow = _flag_property(OVERFLOW, "Overflow flag.")
+    negative = _flag_property(NEGATIVE, "Negative flag.")
+
     @property
     def value(self):
         """ Return the P register as a byte value. """
-        value = 0x00
-        
         if self.emulation:
-            value |= self.ALWAYS_ON_EMULATION
+            value = (self._p & 0xCF) | self.ALWAYS_ON_EMULATION
             if self.break_flag:
                 value |= self.BREAK_FLAG
+            return value
         else:
-            if self.index_register_select:
-                value |= self.INDEX_REGISTER_SELECT
-            if self.memory_select:
-                value |= self.MEMORY_SELECT
-                
-        if self.carry:
-            value |= self.CARRY
-        if self.zero:
-            value |= self.ZERO
-        if self.irq_disable:
-            value |= self.IRQ_DISABLE
-        if self.decimal:
-            value |= self.DECIMAL
-        if self.overflow:
-            value |= self.OVERFLOW
-        if self.negative:
-            value |= self.NEGATIVE
-        
-        return value
-        
+            return self._p
+
     @value.setter
     def value(self, value):
         """ Set the P register from a byte value. """
-        if not self.emulation:
-            self.index_register_select = bool(value & self.INDEX_REGISTER_SELECT)
-            self.memory_select = bool(value & self.MEMORY_SELECT)
-            
-        self.carry = bool(value & self.CARRY)
-        self.zero = bool(value & self.ZERO)
-        self.irq_disable = bool(value & self.IRQ_DISABLE)
-        self.decimal = bool(value & self.DECIMAL)
-        self.overflow = bool(value & self.OVERFLOW)
-        self.negative = bool(value & self.NEGATIVE)
-        
+        if self.emulation:
+            # M/X (and B) are untouchable in emulation mode.
+            self._p = (self._p & 0x30) | (value & 0xCF)
+        else:
+            self._p = value & 0xFF
+
     @property
     def byte_access(self):
         """ Are memory/accumulator accesses 8 bits wide? """
-        return self.emulation or self.memory_select
-    
+        return self.emulation or bool(self._p & self.MEMORY_SELECT)
+
     @property
     def word_access(self):
         """ Are memory/accumulator accesses 16 bits wide? """
-        return not (self.emulation or self.memory_select)
-        
+        return not (self.emulation or self._p & self.MEMORY_SELECT)
+
     @property
     def byte_index(self):
         """ Are index registers (X/Y) 8 bits wide? """
-        return self.emulation or self.index_register_select
-    
+        return self.emulation or bool(self._p & self.INDEX_REGISTER_SELECT)
+
     @property
     def word_index(self):
         """ Are index registers (X/Y) 16 bits wide? """
-        return not (self.emulation or self.index_register_select)
-        
+        return not (self.emulation or self._p & self.INDEX_REGISTER_SELECT)
+
     @property
     def borrow(self):
         """ The carry flag is 0 if a borrow is required and 1 if none is required. """
-        return not self.carry
-        
+        return not self._p & self.CARRY
+
     @borrow.setter
     def borrow(self, value):
         """ Set to true if a borrow is required (left < right in subtraction). """
         self.carry = not value
-        
+
     def set_nz_8(self, value):
         """ Set the N and Z flags from an 8-bit result. """
-        self.zero = value == 0
-        self.negative = bool(value & 0x80)
-        
+        # Branchless: N is bit 7 of the result, Z is (not value) shifted into
+        # bit 1 (False << 1 == 0, True << 1 == 2).
+        self._p = (self._p & 0x7D) | (value & 0x80) | ((not value) << 1)
+
     def set_nz_16(self, value):
         """ Set the N and Z flags from a 16-bit result. """
-        self.zero = value == 0
-        self.negative = bool(value & 0x8000)
-        
+        self._p = (self._p & 0x7D) | ((value >> 8) & 0x80) | ((not value) << 1)
+
 class InvalidOpcodeException(Exception):
     """ Exception raised when an invalid opcode is encountered. """
     def __init__(self, opcode, pbr, pc):
@@ -228,71 +283,164 @@ class Cpu65c816(object):
     """ 65c816 CPU for MySNES. """
     def __init__(self, console):
         self.console = console
+        self.mem = console.mem
         self.psr = ProcessorStatusRegister()
         self.regs = Registers()
-        
-        self.decode_table = {
-            0x08 : self.opcode_php,
-            0x10 : self.opcode_bpl,
-            0x18 : self.opcode_clc,
-            0x1B : self.opcode_tcs,
-            0x20 : self.opcode_jsr,
-            0x38 : self.opcode_sec,
-            0x5B : self.opcode_tcd,
-            0x78 : self.opcode_sei,
-            0x8D : self.opcode_sta_absolute,
-            0x8F : self.opcode_sta_absolute_long,
-            0x98 : self.opcode_tya,
-            0x9C : self.opcode_stz_absolute,
-            0x9F : self.opcode_sta_absolute_long_x,
-            0xA0 : self.opcode_ldy_immediate,
-            0xA2 : self.opcode_ldx_immediate,
-            0xA8 : self.opcode_tay,
-            0xA9 : self.opcode_lda_immediate,
-            0xC2 : self.opcode_rep,
-            0xCA : self.opcode_dex,
-            0xCD : self.opcode_cmp_absolute,
-            0xD0 : self.opcode_bne,
-            0xE2 : self.opcode_sep,
-            0xE9 : self.opcode_sbc_immediate,
-            0xFB : self.opcode_xce,
-        }
+
+        # Program-fetch fast path.  The upper 32K of every bank decodes to a
+        # single contiguous backing buffer, so operand fetches can index it
+        # directly instead of going through two mem method calls.  Refreshed
+        # whenever PBR no longer matches _prog_bank.
+        self._prog_bank = None
+        self._prog_buf = None
+        self._prog_base = 0
+
+        # The stack lives in bank 0 low RAM; keep a direct reference so
+        # pushes don't have to decode the bank/address pair every time.
+        self._stack_ram = console.mem.low_ram
+        
+        # One decode table per (memory width, index width) combination so the
+        # mode-sensitive handlers don't have to test byte_access/byte_index on
+        # every execution.  Mode changes are rare (REP/SEP/XCE), so those
+        # handlers swap self.decode_table to the matching variant instead.
+        self._decode_tables = [
+            self._build_decode_table(word_access, word_index)
+            for word_access in (False, True)
+            for word_index in (False, True)
+        ]
+        self.decode_table = None
+        self._update_decode_table()
+
+    def _build_decode_table(self, word_access, word_index):
+        """ Build the decode table for one memory/index width combination.
+
+        Indexed directly by opcode so dispatch is a single list subscript
+        instead of a dict hash + lookup.  Unassigned slots hold _op_invalid,
+        so the dispatcher needs no found/not-found check at all.
+        """
+        table = [self._op_invalid] * 256
+        table[0x08] = self.opcode_php
+        table[0x10] = self.opcode_bpl
+        table[0x18] = self.opcode_clc
+        table[0x1B] = self.opcode_tcs
+        table[0x20] = self.opcode_jsr
+        table[0x38] = self.opcode_sec
+        table[0x5B] = self.opcode_tcd
+        table[0x78] = self.opcode_sei
+        table[0xC2] = self.opcode_rep
+        table[0xD0] = self.opcode_bne
+        table[0xE2] = self.opcode_sep
+        table[0xFB] = self.opcode_xce
+
+        if word_access:
+            table[0x8D] = self.opcode_sta_absolute_word
+            table[0x8F] = self.opcode_sta_absolute_long_word
+            table[0x98] = self.opcode_tya_word
+            table[0x9C] = self.opcode_stz_absolute_word
+            table[0x9F] = self.opcode_sta_absolute_long_x_word
+            table[0xA9] = self.opcode_lda_immediate_word
+            table[0xCD] = self.opcode_cmp_absolute_word
+            table[0xE9] = self.opcode_sbc_immediate_word
+        else:
+            table[0x8D] = self.opcode_sta_absolute_byte
+            table[0x8F] = self.opcode_sta_absolute_long_byte
+            table[0x98] = self.opcode_tya_byte
+            table[0x9C] = self.opcode_stz_absolute_byte
+            table[0x9F] = self.opcode_sta_absolute_long_x_byte
+            table[0xA9] = self.opcode_lda_immediate_byte
+            table[0xCD] = self.opcode_cmp_absolute_byte
+            table[0xE9] = self.opcode_sbc_immediate_byte
+
+        if word_index:
+            table[0xA0] = self.opcode_ldy_immediate_word
+            table[0xA2] = self.opcode_ldx_immediate_word
+            table[0xA8] = self.opcode_tay_word
+            table[0xCA] = self.opcode_dex_word
+        else:
+            table[0xA0] = self.opcode_ldy_immediate_byte
+            table[0xA2] = self.opcode_ldx_immediate_byte
+            table[0xA8] = self.opcode_tay_byte
+            table[0xCA] = self.opcode_dex_byte
+
+        return table
+
+    def _update_decode_table(self):
+        """ Point decode_table at the variant matching the current mode. """
+        psr = self.psr
+        self.decode_table = self._decode_tables[(psr.word_access << 1) | psr.word_index]
         
     # ********** Instruction fetch and decode functions **********
+    def _cache_program_bank(self):
+        """ Cache the backing buffer for the upper 32K of PBR's bank. """
+        memory, offset, _writable = self.mem.decode(self.regs.PBR, 0x8000)
+        self._prog_bank = self.regs.PBR
+        self._prog_buf = memory
+        self._prog_base = offset
+
     def read_instruction_byte(self):
         """ Fetch the next byte from PBR:PC and increment PC. """
-        value = self.console.mem.read_byte(self.regs.PBR, self.regs.PC)
-        self.regs.PC += 1
+        regs = self.regs
+        pc = regs.PC
+        if pc >= 0x8000:
+            if regs.PBR != self._prog_bank:
+                self._cache_program_bank()
+            buf = self._prog_buf
+            if buf is not None:
+                regs.PC = (pc + 1) & 0xFFFF
+                return buf[self._prog_base + (pc & 0x7FFF)]
+        value = self.mem.read_byte(regs.PBR, pc)
+        regs.PC = (pc + 1) & 0xFFFF
         return value
-        
+
     def read_instruction_word(self):
         """ Fetch the next word from PBR:PC and increment PC. """
-        value = self.console.mem.read_word(self.regs.PBR, self.regs.PC)
-        self.regs.PC += 2
+        regs = self.regs
+        pc = regs.PC
+        if 0x8000 <= pc < 0xFFFF: # Word must not cross the bank boundary.
+            if regs.PBR != self._prog_bank:
+                self._cache_program_bank()
+            buf = self._prog_buf
+            if buf is not None:
+                offset = self._prog_base + (pc & 0x7FFF)
+                regs.PC = (pc + 2) & 0xFFFF
+                return buf[offset] | (buf[offset + 1] << 8)
+        value = self.mem.read_word(regs.PBR, pc)
+        regs.PC = (pc + 2) & 0xFFFF
         return value
-        
+
+    def _op_invalid(self):
+        """ UNKNOWN - Raise InvalidOpcodeException for an unmapped opcode. """
+        regs = self.regs
+        pc = (regs.PC - 1) & 0xFFFF # PC has already advanced past the opcode.
+        opcode = self.mem.read_byte(regs.PBR, pc)
+        raise InvalidOpcodeException(opcode, regs.PBR, pc)
+
     def fetch(self):
         """ Fetch, decode, and execute the next instruction at PBR:PC. """
-        pbr, pc = self.regs.PBR, self.regs.PC
-        opcode = self.read_instruction_byte()
-        
-        opcode_handler = self.decode_table.get(opcode, None)
-        if opcode_handler is not None:
-            opcode_handler()
-        else:
-            raise InvalidOpcodeException(opcode, pbr, pc)
-        
-    # ********** Stack management functions **********
-    def _push_byte(self, value):
-        """ Pushes the given byte onto the stack. """
-        self.console.mem.write_byte(0x00, self.regs.SP, value)
-        self.regs.SP -= 1
-
-    def _push_word(self, value):
-        """ Pushes the given word onto the stack. """
-        self.console.mem.write_word(0x00, self.regs.SP, value)
-        self.regs.SP -= 2
-        
+        # The opcode fetch is inlined here (rather than calling
+        # read_instruction_byte) to keep the dispatch loop down to a single
+        # Python method call per instruction.
+        regs = self.regs
+        opcode = self.mem.read_byte(regs.PBR, regs.PC)
+        regs.PC = (regs.PC + 1) & 0xFFFF
+        self.decode_table[opcode]()
+
+    def fetch_n(self, count):
+        """ Fetch, decode, and execute the next count instructions.
+
+        Lets the main loop amortize its per-instruction call overhead when the
+        debugger doesn't need to see every instruction.
+        """
+        regs = self.regs
+        read_byte = self.mem.read_byte
+        for _ in range(count):
+            pc = regs.PC
+            opcode = read_byte(regs.PBR, pc)
+            regs.PC = (pc + 1) & 0xFFFF
+
+            # Re-read decode_table each time: REP/SEP/XCE may swap it.
+            self.decode_table[opcode]()
+
     # ********** Opcode handler functions **********
     def opcode_sei(self):
         """ SEI - Set the interrupt disable flag. """
@@ -311,173 +459,259 @@ class Cpu65c816(object):
         
     def opcode_rep(self):
         """ REP - Clear processor status bits from mask. """
-        value = self.read_instruction_byte()
-        self.psr.value = self.psr.value & (~value)
+        mask = self.read_instruction_byte()
+        psr = self.psr
+        if psr.emulation:
+            mask &= 0xCF # M/X are untouchable in emulation mode.
+        psr._p &= ~mask & 0xFF # pylint: disable=protected-access
+        self._update_decode_table()
         return 3
-        
+
     def opcode_sep(self):
         """ SEP - Set processor status bits from mask. """
-        value = self.read_instruction_byte()
-        self.psr.value = self.psr.value | value
+        mask = self.read_instruction_byte()
+        psr = self.psr
+        if psr.emulation:
+            mask &= 0xCF # M/X are untouchable in emulation mode.
+        psr._p |= mask # pylint: disable=protected-access
+        self._update_decode_table()
         return 3
         
     def opcode_xce(self):
         """ XCE - Exchange the carry and emulation flag. """
-        old_emulation = self.psr.emulation
-        self.psr.emulation = self.psr.carry
-        self.psr.carry = old_emulation
+        psr = self.psr
+        old_emulation = psr.emulation
+        psr.emulation = psr.carry
+        psr.carry = old_emulation
+        self._update_decode_table()
         return 2
         
-    def opcode_stz_absolute(self):
-        """ STZ abs - Store zero absolute. """
+    def opcode_stz_absolute_byte(self):
+        """ STZ abs - Store zero absolute (8-bit). """
         address = self.read_instruction_word()
-        if self.psr.byte_access:
-            self.console.mem.write_byte(self.regs.DBR, address, 0x00)
-            return 4
-        else:
-            self.console.mem.write_word(self.regs.DBR, address, 0x0000)
-            return 5
+        self.mem.write_byte(self.regs.DBR, address, 0x00)
+        return 4
+        
+    def opcode_stz_absolute_word(self):
+        """ STZ abs - Store zero absolute (16-bit). """
+        address = self.read_instruction_word()
+        self.mem.write_word(self.regs.DBR, address, 0x0000)
+        return 5
             
-    def opcode_lda_immediate(self):
-        """ LDA imm - Load accumulator with immediate. """
-        if self.psr.byte_access:
-            self.regs.A = self.read_instruction_byte()
-            self.psr.set_nz_8(self.regs.A)
-            return 2
-        else:
-            self.regs.C = self.read_instruction_word()
-            self.psr.set_nz_16(self.regs.C)
-            return 3
+    def opcode_lda_immediate_byte(self):
+        """ LDA imm - Load accumulator with immediate (8-bit). """
+        value = self.read_instruction_byte()
+        self.regs.A = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | (value & 0x80) | ((not value) << 1) # pylint: disable=protected-access
+        return 2
+        
+    def opcode_lda_immediate_word(self):
+        """ LDA imm - Load accumulator with immediate (16-bit). """
+        value = self.read_instruction_word()
+        self.regs.C = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | ((value >> 8) & 0x80) | ((not value) << 1) # pylint: disable=protected-access
+        return 3
             
-    def opcode_ldx_immediate(self):
-        """ LDX imm - Load X with immediate. """
-        if self.psr.byte_index:
-            self.regs.XL = self.read_instruction_byte()
-            self.psr.set_nz_8(self.regs.XL)
-            return 2
-        else:
-            self.regs.X = self.read_instruction_word()
-            self.psr.set_nz_16(self.regs.X)
-            return 3
+    def opcode_ldx_immediate_byte(self):
+        """ LDX imm - Load X with immediate (8-bit). """
+        value = self.read_instruction_byte()
+        self.regs.XL = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | (value & 0x80) | ((not value) << 1) # pylint: disable=protected-access
+        return 2
+        
+    def opcode_ldx_immediate_word(self):
+        """ LDX imm - Load X with immediate (16-bit). """
+        value = self.read_instruction_word()
+        self.regs.X = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | ((value >> 8) & 0x80) | ((not value) << 1) # pylint: disable=protected-access
+        return 3
             
-    def opcode_ldy_immediate(self):
-        """ LDY imm - Load Y with immediate. """
-        if self.psr.byte_index:
-            self.regs.YL = self.read_instruction_byte()
-            self.psr.set_nz_8(self.regs.YL)
-            return 2
-        else:
-            self.regs.Y = self.read_instruction_word()
-            self.psr.set_nz_16(self.regs.Y)
-            return 3
+    def opcode_ldy_immediate_byte(self):
+        """ LDY imm - Load Y with immediate (8-bit). """
+        value = self.read_instruction_byte()
+        self.regs.YL = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | (value & 0x80) | ((not value) << 1) # pylint: disable=protected-access
+        return 2
+        
+    def opcode_ldy_immediate_word(self):
+        """ LDY imm - Load Y with immediate (16-bit). """
+        value = self.read_instruction_word()
+        self.regs.Y = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | ((value >> 8) & 0x80) | ((not value) << 1) # pylint: disable=protected-access
+        return 3
             
-    def opcode_sta_absolute(self):
-        """ STA abs - Store memory absolute. """
+    def opcode_sta_absolute_byte(self):
+        """ STA abs - Store memory absolute (8-bit). """
+        regs = self.regs
         address = self.read_instruction_word()
-        if self.psr.byte_access:
-            self.console.mem.write_byte(self.regs.DBR, address, self.regs.A)
-            return 4
-        else:
-            self.console.mem.write_word(self.regs.DBR, address, self.regs.C)
-            return 5
+        self.mem.write_byte(regs.DBR, address, regs.A)
+        return 4
+        
+    def opcode_sta_absolute_word(self):
+        """ STA abs - Store memory absolute (16-bit). """
+        regs = self.regs
+        address = self.read_instruction_word()
+        self.mem.write_word(regs.DBR, address, regs.C)
+        return 5
             
-    def opcode_sta_absolute_long(self):
-        """ STA long - Store memory absolute long. """
+    def opcode_sta_absolute_long_byte(self):
+        """ STA long - Store memory absolute long (8-bit). """
         address = self.read_instruction_word()
         bank = self.read_instruction_byte()
-        if self.psr.byte_access:
-            self.console.mem.write_byte(bank, address, self.regs.A)
-            return 5
-        else:
-            self.console.mem.write_word(bank, address, self.regs.C)
-            return 6
+        self.mem.write_byte(bank, address, self.regs.A)
+        return 5
+        
+    def opcode_sta_absolute_long_word(self):
+        """ STA long - Store memory absolute long (16-bit). """
+        address = self.read_instruction_word()
+        bank = self.read_instruction_byte()
+        self.mem.write_word(bank, address, self.regs.C)
+        return 6
             
-    def opcode_sta_absolute_long_x(self):
-        """ STA long - Store memory absolute long + X. """
-        address = self.read_instruction_word() + self.regs.X
+    def opcode_sta_absolute_long_x_byte(self):
+        """ STA long - Store memory absolute long + X (8-bit). """
+        regs = self.regs
+        address = self.read_instruction_word()
         bank = self.read_instruction_byte()
-        if self.psr.byte_access:
-            self.console.mem.write_byte(bank, address, self.regs.A)
-            return 5
-        else:
-            self.console.mem.write_word(bank, address, self.regs.C)
-            return 6
+        # 24-bit add: X carries into the bank byte, and the masks keep the
+        # effective address from leaking past 16 bits into the memory map.
+        full = (((bank << 16) | address) + regs.X) & 0xFFFFFF
+        self.mem.write_byte24(full, regs.A)
+        return 5
+
+    def opcode_sta_absolute_long_x_word(self):
+        """ STA long - Store memory absolute long + X (16-bit). """
+        regs = self.regs
+        address = self.read_instruction_word()
+        bank = self.read_instruction_byte()
+        full = (((bank << 16) | address) + regs.X) & 0xFFFFFF
+        self.mem.write_word24(full, regs.C)
+        return 6
             
     def opcode_tcd(self):
         """ TCD - Transfer 16-bit accumulator to direct page register. """
-        self.regs.DP = self.regs.C
+        regs = self.regs
+        regs.DP = regs.C
         return 2
         
     def opcode_tcs(self):
         """ TCS - Transfer 16-bit accumulator to stack register. """
-        self.regs.SP = self.regs.C
+        regs = self.regs
+        regs.SP = regs.C
         return 2
         
-    def opcode_tya(self):
-        """ TYA - Transfer Y to accumulator. """
-        if self.psr.byte_access:
-            self.regs.A = self.regs.YL
-            self.psr.set_nz_8(self.regs.A)
-        else:
-            self.regs.C = self.regs.Y
-            self.psr.set_nz_16(self.regs.C)
+    def opcode_tya_byte(self):
+        """ TYA - Transfer Y to accumulator (8-bit). """
+        regs = self.regs
+        value = regs.YL
+        regs.A = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | (value & 0x80) | ((not value) << 1) # pylint: disable=protected-access
         return 2
         
-    def opcode_tay(self):
-        """ TAY - Transfer accumulator to Y. """
-        if self.psr.byte_index:
-            self.regs.YL = self.regs.A
-            self.psr.set_nz_8(self.regs.YL)
-        else:
-            self.regs.Y = self.regs.C
-            self.psr.set_nz_16(self.regs.Y)
+    def opcode_tya_word(self):
+        """ TYA - Transfer Y to accumulator (16-bit). """
+        regs = self.regs
+        value = regs.Y
+        regs.C = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | ((value >> 8) & 0x80) | ((not value) << 1) # pylint: disable=protected-access
         return 2
         
-    def opcode_sbc_immediate(self):
-        """ SBC imm - Subtract with borrow from accumulator. """
-        assert not self.psr.decimal, "Not implemented yet!"
-        if self.psr.byte_access:
-            value = self.read_instruction_byte()
-            self.regs.A = (self.regs.A - value) - (0 if self.psr.carry else 1)
-            self.psr.set_nz_8(self.regs.A)
-            return 2
-        else:
-            value = self.read_instruction_word()
-            self.regs.C = (self.regs.C - value) - (0 if self.psr.carry else 1)
-            self.psr.set_nz_16(self.regs.C)
-            return 3
+    def opcode_tay_byte(self):
+        """ TAY - Transfer accumulator to Y (8-bit). """
+        regs = self.regs
+        value = regs.A
+        regs.YL = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | (value & 0x80) | ((not value) << 1) # pylint: disable=protected-access
+        return 2
+        
+    def opcode_tay_word(self):
+        """ TAY - Transfer accumulator to Y (16-bit). """
+        regs = self.regs
+        value = regs.C
+        regs.Y = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | ((value >> 8) & 0x80) | ((not value) << 1) # pylint: disable=protected-access
+        return 2
+        
+    def opcode_sbc_immediate_byte(self):
+        """ SBC imm - Subtract with borrow from accumulator (8-bit). """
+        regs = self.regs
+        psr = self.psr
+        assert not psr.decimal, "Not implemented yet!"
+        value = self.read_instruction_byte()
+        result = ((regs.A - value) - (0 if psr.carry else 1)) & 0xFF
+        regs.A = result
+        psr._p = (psr._p & 0x7D) | (result & 0x80) | ((not result) << 1) # pylint: disable=protected-access
+        return 2
+        
+    def opcode_sbc_immediate_word(self):
+        """ SBC imm - Subtract with borrow from accumulator (16-bit). """
+        regs = self.regs
+        psr = self.psr
+        assert not psr.decimal, "Not implemented yet!"
+        value = self.read_instruction_word()
+        result = ((regs.C - value) - (0 if psr.carry else 1)) & 0xFFFF
+        regs.C = result
+        psr._p = (psr._p & 0x7D) | ((result >> 8) & 0x80) | ((not result) << 1) # pylint: disable=protected-access
+        return 3
             
-    def opcode_cmp_absolute(self):
-        """ CMP abs - Compares the accumulator with the value at the given address. """
+    def opcode_cmp_absolute_byte(self):
+        """ CMP abs - Compares the accumulator with the value at the given address (8-bit). """
+        regs = self.regs
+        psr = self.psr
         address = self.read_instruction_word()
-        if self.psr.byte_access:
-            value = self.console.mem.read_byte(self.regs.DBR, address)
-            result = self.regs.A - value
-            self.psr.set_nz_8(result)
-            self.psr.borrow = self.regs.A < value
-            return 4
-        else:
-            value = self.console.mem.read_word(self.regs.DBR, address)
-            result = self.regs.C - value
-            self.psr.set_nz_16(result)
-            self.psr.borrow = self.regs.C < value
-            return 5
+        value = self.mem.read_byte(regs.DBR, address)
+        accumulator = regs.A
+        result = (accumulator - value) & 0xFF
+        psr._p = (psr._p & 0x7D) | (result & 0x80) | ((not result) << 1) # pylint: disable=protected-access
+        psr.borrow = accumulator < value
+        return 4
+        
+    def opcode_cmp_absolute_word(self):
+        """ CMP abs - Compares the accumulator with the value at the given address (16-bit). """
+        regs = self.regs
+        psr = self.psr
+        address = self.read_instruction_word()
+        value = self.mem.read_word(regs.DBR, address)
+        accumulator = regs.C
+        result = (accumulator - value) & 0xFFFF
+        psr._p = (psr._p & 0x7D) | ((result >> 8) & 0x80) | ((not result) << 1) # pylint: disable=protected-access
+        psr.borrow = accumulator < value
+        return 5
             
-    def opcode_dex(self):
-        """ DEX - Decrement X. """
-        if self.psr.byte_index:
-            self.regs.XL = self.regs.XL - 1
-            self.psr.set_nz_8(self.regs.XL)
-        else:
-            self.regs.X = self.regs.X - 1
-            self.psr.set_nz_16(self.regs.X)
+    def opcode_dex_byte(self):
+        """ DEX - Decrement X (8-bit). """
+        regs = self.regs
+        value = (regs.XL - 1) & 0xFF
+        regs.XL = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | (value & 0x80) | ((not value) << 1) # pylint: disable=protected-access
+        return 2
+        
+    def opcode_dex_word(self):
+        """ DEX - Decrement X (16-bit). """
+        regs = self.regs
+        value = (regs.X - 1) & 0xFFFF
+        regs.X = value
+        psr = self.psr
+        psr._p = (psr._p & 0x7D) | ((value >> 8) & 0x80) | ((not value) << 1) # pylint: disable=protected-access
         return 2
         
     def opcode_bpl(self):
         """ BPL - Branch if plus (n=0). """
         offset = self.read_instruction_byte()
         if not self.psr.negative:
-            self.regs.PC += signed_byte(offset)
+            regs = self.regs
+            regs.PC = (regs.PC + signed_byte(offset)) & 0xFFFF
             return 3 # TODO: +1 for page boundary in emulation mode?
         else:
             return 2
@@ -486,7 +720,8 @@ class Cpu65c816(object):
         """ BNE - Branch if not equal (z=0). """
         offset = self.read_instruction_byte()
         if not self.psr.zero:
-            self.regs.PC += signed_byte(offset)
+            regs = self.regs
+            regs.PC = (regs.PC + signed_byte(offset)) & 0xFFFF
             return 3 # TODO: +1 for page boundary in emulation mode?
         else:
             return 2
@@ -494,12 +729,30 @@ class Cpu65c816(object):
     def opcode_jsr(self):
         """ JSR - Jump subroutine absolute. """
         destination = self.read_instruction_word()
-        self._push_word(self.regs.PC)
-        self.regs.PC = destination
+        regs = self.regs
+        sp = regs.SP
+        pc = regs.PC
+        if 1 <= sp < LOW_RAM_SIZE:
+            # Push straight into low RAM: high byte at SP, low at SP-1.
+            ram = self._stack_ram
+            ram[sp] = (pc >> 8) & 0xFF
+            ram[sp - 1] = pc & 0xFF
+        else:
+            mem = self.mem
+            mem.write_byte(0x00, sp, (pc >> 8) & 0xFF)
+            mem.write_byte(0x00, (sp - 1) & 0xFFFF, pc & 0xFF)
+        regs.SP = (sp - 2) & 0xFFFF
+        regs.PC = destination
         return 6
         
     def opcode_php(self):
         """ PHP - Push processor status register. """
-        self._push_byte(self.psr.value)
+        regs = self.regs
+        sp = regs.SP
+        if sp < LOW_RAM_SIZE:
+            self._stack_ram[sp] = self.psr.value
+        else:
+            self.mem.write_byte(0x00, sp, self.psr.value)
+        regs.SP = (sp - 1) & 0xFFFF
         return 3
         
\ No newline at end of file
@@ -7,6 +7,9 @@ from __future__ import print_function
 # Standard library imports
 import sys
 
+# Six imports
+from six.moves import input as raw_input # pylint: disable=redefined-builtin
+
 # Logging setup
 import logging
 log = logging.getLogger(__name__) # pylint: disable=invalid-name
@@ -15,6 +18,10 @@ log.addHandler(logging.NullHandler())
 # Constants
 
 # Functions
+def _parse_addr(text):
+    """ Parse a "pbr:pc" style hex pair into a (PBR, PC) tuple. """
+    (pbr, pc) = text.split(":")
+    return (int(pbr, 16), int(pc, 16))
 
 # Classes
 class Debugger(object):
@@ -24,14 +31,62 @@ class Debugger(object):
         self.cpu = console.cpu
         self.mem = console.mem
         
-        self.breakpoints = []
+        self.breakpoints = set() # O(1) membership in should_break().
         self.single_step = False
         self.debugger_shortcut = []
         self.dump_enabled = False
+
+        # Mnemonics parsed out of the handler docstrings once, so the
+        # per-instruction preview is a list index instead of a string split.
+        # The mnemonic half of the docstring is identical across the
+        # per-mode handler variants, so any decode table will do.
+        self._descriptions = [
+            handler.__doc__.split(" - ")[0].strip() if handler.__doc__ else "UNKNOWN"
+            for handler in self.cpu.decode_table
+        ]
+
+        # poll() dispatches through _hot_poll so the common idle case is a
+        # no-op call rather than re-testing the watch state every instruction.
+        self._hot_poll = self._noop_poll
+        self._refresh_poll()
+
+        # Command dispatch table; aliases share a handler.
+        self._cmds = {
+            "continue": self._cmd_continue, "c": self._cmd_continue,
+            "step": self._cmd_step, "s": self._cmd_step,
+            "quit": self._cmd_quit, "q": self._cmd_quit,
+            "dump": self._cmd_dump, "d": self._cmd_dump,
+            "stack": self._cmd_stack, "st": self._cmd_stack,
+            "info": self._cmd_info,
+            "break": self._cmd_break,
+            "clear": self._cmd_clear,
+            "set": self._cmd_set,
+        }
         
+    @property
+    def active(self):
+        """ Does the debugger need to look at every instruction? """
+        return self.single_step or self.dump_enabled or bool(self.breakpoints)
+
+    def request_break(self):
+        """ Drop into single-step mode from outside, e.g. the Control-C handler. """
+        self.single_step = True
+        self._refresh_poll()
+
+    def _refresh_poll(self):
+        """ Point poll() at the real body only while the debugger is active. """
+        self._hot_poll = self._full_poll if self.active else self._noop_poll
+
+    def _noop_poll(self):
+        """ poll() stand-in while nothing is being watched. """
+
     def poll(self):
         """ Run one iteration of the debugger, going interactive if single-stepping. """
-        if self.dump_enabled:
+        self._hot_poll()
+
+    def _full_poll(self):
+        """ The real poll() body, swapped in while the debugger is active. """
+        if self.dump_enabled and log.isEnabledFor(logging.DEBUG):
             log.debug("")
             self.dump_regs()
             self.preview_next_instruction()
@@ -41,36 +96,37 @@ class Debugger(object):
             
     def dump_regs(self):
         """ Dump all registers. """
-        log.debug("B,A = 0x%02x,0x%02x C = 0x%04x", self.cpu.regs.B, self.cpu.regs.A, self.cpu.regs.C)
-        log.debug("X = 0x%04x Y = 0x%04x", self.cpu.regs.X, self.cpu.regs.Y)
-        log.debug("DBR = 0x%02x SP = 0x%04x DP = 0x%04x", self.cpu.regs.DBR, self.cpu.regs.SP, self.cpu.regs.DP)
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+        # Resolve the attribute chains once rather than per format argument.
+        regs = self.cpu.regs
+        psr = self.cpu.psr
+        log.debug("B,A = 0x%02x,0x%02x C = 0x%04x", regs.B, regs.A, regs.C)
+        log.debug("X = 0x%04x Y = 0x%04x", regs.X, regs.Y)
+        log.debug("DBR = 0x%02x SP = 0x%04x DP = 0x%04x", regs.DBR, regs.SP, regs.DP)
         log.debug(
             "P = 0x%02x [%s|%s|%s|%s|%s|%s|%s|%s] %s",
-            self.cpu.psr.value,
-            "N" if self.cpu.psr.negative else "n",
-            "O" if self.cpu.psr.overflow else "o",
-            "-" if self.cpu.psr.emulation else ("M8" if self.cpu.psr.memory_select else "m16"),
-            (("B" if self.cpu.psr.break_flag else "b") if self.cpu.psr.emulation else
-             ("I8" if self.cpu.psr.memory_select else "i16")),
-            "D" if self.cpu.psr.decimal else "d",
-            "I" if self.cpu.psr.irq_disable else "i",
-            "Z" if self.cpu.psr.zero else "z",
-            "C" if self.cpu.psr.carry else "c",
-            "Emulation" if self.cpu.psr.emulation else "Native",
+            psr.value,
+            "N" if psr.negative else "n",
+            "O" if psr.overflow else "o",
+            "-" if psr.emulation else ("M8" if psr.memory_select else "m16"),
+            (("B" if psr.break_flag else "b") if psr.emulation else
+             ("I8" if psr.memory_select else "i16")),
+            "D" if psr.decimal else "d",
+            "I" if psr.irq_disable else "i",
+            "Z" if psr.zero else "z",
+            "C" if psr.carry else "c",
+            "Emulation" if psr.emulation else "Native",
         )
-        log.debug("PBR:PC = %02x:%04x", self.cpu.regs.PBR, self.cpu.regs.PC)
+        log.debug("PBR:PC = %02x:%04x", regs.PBR, regs.PC)
         
     def preview_next_instruction(self):
         """ Read next opcode and decode to the mnemonic. """
+        if not log.isEnabledFor(logging.DEBUG):
+            return
         opcode = self.mem.read_byte(self.cpu.regs.PBR, self.cpu.regs.PC)
         
-        opcode_handler = self.cpu.decode_table.get(opcode, None)
-        if opcode_handler is not None:
-            description = opcode_handler.__doc__.split(" - ")[0].strip()
-        else:
-            description = "UNKNOWN"
-            
-        log.debug("Next instruction: 0x%02x (%s)", opcode, description)
+        log.debug("Next instruction: 0x%02x (%s)", opcode, self._descriptions[opcode])
         
     def dump_stack(self, count):
         """ Read next opcode and decode to the mnemonic. """
@@ -100,6 +156,7 @@ class Debugger(object):
                 
             try:
                 resume = self.process_command(cmd)
+                self._refresh_poll()
                 if resume:
                     break
             except Exception:
@@ -116,48 +173,67 @@ class Debugger(object):
         if len(cmd) == 0:
             return False
             
-        if len(cmd) == 1 and cmd[0] in ("continue", "c"):
+        handler = self._cmds.get(cmd[0], None)
+        if handler is not None:
+            return bool(handler(cmd))
+        return False
+        
+    def _cmd_continue(self, cmd):
+        """ continue - Resume execution. """
+        if len(cmd) == 1:
             self.single_step = False
             return True
             
-        elif len(cmd) == 1 and cmd[0] in ("step", "s"):
+    def _cmd_step(self, cmd):
+        """ step - Execute one instruction and break again. """
+        if len(cmd) == 1:
             self.single_step = True
             return True
             
-        elif len(cmd) == 1 and cmd[0] in ("quit", "q"):
+    def _cmd_quit(self, cmd):
+        """ quit - Exit the emulator. """
+        if len(cmd) == 1:
             sys.exit(0)
             
-        elif len(cmd) == 1 and cmd[0] in ("dump", "d"):
+    def _cmd_dump(self, cmd):
+        """ dump - Dump all registers once. """
+        if len(cmd) == 1:
             self.dump_regs()
             
-        elif len(cmd) == 2 and cmd[0] in ("stack", "st"):
+    def _cmd_stack(self, cmd):
+        """ stack <count> - Dump bytes from the stack. """
+        if len(cmd) == 2:
             self.dump_stack(int(cmd[1]))
             
-        elif len(cmd) >= 1 and cmd[0] == "info":
-            self.debugger_shortcut = []
-            if len(cmd) == 2 and cmd[1] in ("breakpoints", "break"):
-                print("Breakpoints:")
-                for breakpoint in self.breakpoints:
-                    print("  %04x:%04x" % breakpoint)
-                    
-        elif len(cmd) == 2 and cmd[0] == "break":
+    def _cmd_info(self, cmd):
+        """ info breakpoints - List breakpoints. """
+        self.debugger_shortcut = []
+        if len(cmd) == 2 and cmd[1] in ("breakpoints", "break"):
+            print("Breakpoints:")
+            for breakpoint in sorted(self.breakpoints):
+                print("  %04x:%04x" % breakpoint)
+                
+    def _cmd_break(self, cmd):
+        """ break <pbr:pc> - Set a breakpoint. """
+        if len(cmd) == 2:
             self.debugger_shortcut = []
-            (pbr, pc) = cmd[1].split(":")
-            self.breakpoints.append((int(pbr, 16), int(pc, 16)))
+            self.breakpoints.add(_parse_addr(cmd[1]))
             
-        elif len(cmd) == 2 and cmd[0] == "clear":
+    def _cmd_clear(self, cmd):
+        """ clear <pbr:pc>|all|dump - Clear breakpoints or register dumping. """
+        if len(cmd) == 2:
             self.debugger_shortcut = []
             if cmd[1] == "all":
-                self.breakpoints = []
+                self.breakpoints.clear()
             elif cmd[1] == "dump":
                 self.dump_enabled = False
             else:
-                (pbr, pc) = cmd[1].split(":")
-                self.breakpoints.remove((int(pbr, 16), int(pc, 16)))
-                    
-        elif len(cmd) >= 1 and cmd[0] == "set":
-            self.debugger_shortcut = []
-            if len(cmd) == 2 and cmd[1] == "dump":
-                self.dump_enabled = True
-                self.dump_regs()
-                
\ No newline at end of file
+                self.breakpoints.discard(_parse_addr(cmd[1]))
+                
+    def _cmd_set(self, cmd):
+        """ set dump - Dump registers before every instruction. """
+        self.debugger_shortcut = []
+        if len(cmd) == 2 and cmd[1] == "dump":
+            self.dump_enabled = True
+            self.dump_regs()
+            
\ No newline at end of file
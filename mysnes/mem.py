@@ -7,7 +7,7 @@ http://www.cs.umb.edu/~bazz/snes/cartridges/lorom.html
 """
 
 # Standard library imports
-import array
+import struct
 
 # Local imports
 from .mmio import MMIO
@@ -23,84 +23,296 @@ HIGH_RAM_SIZE = 0x6000
 EXT_RAM_SIZE = 0x18000
 SRAM_SIZE = 0x8000
 
+PAGE_SHIFT = 13 # Decode granularity is 8K pages: no region boundary is finer.
+PAGE_MASK = 0x1FFF
+
+# Layout of the single flat backing buffer.  Keeping low RAM at offset zero
+# means a bank 0x00 address below 0x2000 is also its flat offset, and putting
+# extended RAM right after high RAM makes the full 128K of WRAM (banks
+# 0x7E-0x7F) one contiguous run.
+LOW_RAM_BASE = 0x00000
+HIGH_RAM_BASE = LOW_RAM_BASE + LOW_RAM_SIZE
+EXT_RAM_BASE = HIGH_RAM_BASE + HIGH_RAM_SIZE
+SRAM_BASE = EXT_RAM_BASE + EXT_RAM_SIZE
+ROM_BASE = SRAM_BASE + SRAM_SIZE
+
+# Set True to log every memory access.  Checked once while the accessors
+# are bound at construction, so a production run pays nothing for it; the
+# old way was commented-out log.debug lines in the hot bodies.
+TRACE_MEM = False
+
+# Sentinel page offsets for space that is not backed by the flat buffer.
+MMIO_PAGE = -1
+UNMAPPED_PAGE = -2
+READONLY_PAGE = -3 # Write table only: reads go to the buffer, writes are dropped.
+
 # Functions
+def _traced(name, accessor):
+    """ Wrap a memory accessor so every call is logged (TRACE_MEM only). """
+    def tracer(bank, address, *args):
+        result = accessor(bank, address, *args)
+        log.debug("%s(%02x:%04x) %r -> %r", name, bank, address, args, result)
+        return result
+    return tracer
+
+_unpack_u16 = struct.Struct("<H").unpack_from # pylint: disable=invalid-name
+_pack_u16 = struct.Struct("<H").pack_into # pylint: disable=invalid-name
 
 # Classes
 class LoRomMemoryMap(object):
     """ Memory bank/address decoder for "LoROM" cartridges. """
     def __init__(self, rom_data):
         self.mmio = MMIO()
-        self.lo_rom = array.array("B", rom_data)
-        self.low_ram = array.array("B", (0,) * LOW_RAM_SIZE)
-        self.high_ram = array.array("B", (0,) * HIGH_RAM_SIZE)
-        self.extended_ram = array.array("B", (0,) * EXT_RAM_SIZE)
-        self.cartridge_sram = array.array("B", (0,) * SRAM_SIZE)
-        
+
+        # All directly-addressable storage lives in one flat bytearray so
+        # every access is a single bytearray subscript instead of picking one
+        # of five array objects first.  The named views exist for callers
+        # (CPU stack fast path, debugger) that want a region by name.
+        self._flat = bytearray(ROM_BASE)
+        self._flat.extend(rom_data)
+        flat_view = memoryview(self._flat)
+        self.low_ram = flat_view[LOW_RAM_BASE:LOW_RAM_BASE + LOW_RAM_SIZE]
+        self.high_ram = flat_view[HIGH_RAM_BASE:HIGH_RAM_BASE + HIGH_RAM_SIZE]
+        self.extended_ram = flat_view[EXT_RAM_BASE:EXT_RAM_BASE + EXT_RAM_SIZE]
+        self.cartridge_sram = flat_view[SRAM_BASE:SRAM_BASE + SRAM_SIZE]
+        self.lo_rom = flat_view[ROM_BASE:]
+
+        # Precomputed page offset tables: one flat-buffer offset per
+        # (bank, 8K page) pair, indexed by (bank << 3) | (address >> 13),
+        # such that _flat[offset + (address & PAGE_MASK)] is bank:address.
+        # Negative entries mark pages that need the slow path (MMIO) or have
+        # no backing storage.  Every region is linear within a page, so
+        # running the decode() branch cascade once per page start captures
+        # the whole map.
+        self._read_off = []
+        self._write_off = []
+        for bank in range(256):
+            for page in range(8):
+                memory, offset, writable = self.decode(bank, page << PAGE_SHIFT)
+                if memory is None:
+                    self._read_off.append(UNMAPPED_PAGE)
+                    self._write_off.append(UNMAPPED_PAGE)
+                elif memory is self.mmio:
+                    self._read_off.append(MMIO_PAGE)
+                    self._write_off.append(MMIO_PAGE)
+                else:
+                    self._read_off.append(offset)
+                    self._write_off.append(offset if writable else READONLY_PAGE)
+
+        self._bind_fast_accessors()
+
+    def _bind_fast_accessors(self):
+        """ Install read_byte/write_byte as closures over the decoded layout.
+
+        Everything the per-byte paths touch is captured as a closure cell, so
+        a call is all LOAD_FAST/LOAD_DEREF and subscripting: no attribute
+        walks through self and no bound-method object per call.  The layout
+        tables never change after construction, which is what makes the
+        specialization safe.
+        """
+        read_off = self._read_off
+        write_off = self._write_off
+        flat = self._flat
+        mmio = self.mmio
+
+        def read_byte(bank, address):
+            """ Read a byte from the given bank/address pair. """
+            offset = read_off[(bank << 3) | (address >> PAGE_SHIFT)]
+            if offset >= 0:
+                return flat[offset + (address & PAGE_MASK)]
+            if offset == MMIO_PAGE:
+                return mmio[address]
+            log.warning("Read from unmapped memory %02x:%04x, returning 0", bank, address)
+            return 0
+
+        def write_byte(bank, address, value):
+            """ Write a byte to the given bank/address pair. """
+            offset = write_off[(bank << 3) | (address >> PAGE_SHIFT)]
+            if offset >= 0:
+                flat[offset + (address & PAGE_MASK)] = value
+            elif offset == MMIO_PAGE:
+                mmio[address] = value
+            elif offset == UNMAPPED_PAGE:
+                log.warning("Write to unmapped memory %02x:%04x ignored (0x%02x)", bank, address, value)
+
+        # 24-bit flavors: callers that already hold a full bank:address
+        # value (long addressing modes, DMA source registers) pass the one
+        # int straight through.  The table index (bank << 3) | (address >> 13)
+        # is exactly addr24 >> 13, so no unpacking happens at all.
+        def read_byte24(addr24):
+            """ Read a byte at a 24-bit bank:address value. """
+            offset = read_off[addr24 >> PAGE_SHIFT]
+            if offset >= 0:
+                return flat[offset + (addr24 & PAGE_MASK)]
+            if offset == MMIO_PAGE:
+                return mmio[addr24 & 0xFFFF]
+            log.warning("Read from unmapped memory %06x, returning 0", addr24)
+            return 0
+
+        def write_byte24(addr24, value):
+            """ Write a byte at a 24-bit bank:address value. """
+            offset = write_off[addr24 >> PAGE_SHIFT]
+            if offset >= 0:
+                flat[offset + (addr24 & PAGE_MASK)] = value
+            elif offset == MMIO_PAGE:
+                mmio[addr24 & 0xFFFF] = value
+            elif offset == UNMAPPED_PAGE:
+                log.warning("Write to unmapped memory %06x ignored (0x%02x)", addr24, value)
+
+        if TRACE_MEM:
+            read_byte = _traced("read_byte", read_byte)
+            write_byte = _traced("write_byte", write_byte)
+            self.read_word = _traced("read_word", self.read_word)
+            self.write_word = _traced("write_word", self.write_word)
+
+        self.read_byte = read_byte
+        self.write_byte = write_byte
+        self.read_byte24 = read_byte24
+        self.write_byte24 = write_byte24
+
+    def read_word24(self, addr24):
+        """ Read a word at a 24-bit bank:address value. """
+        return self.read_word(addr24 >> 16, addr24 & 0xFFFF)
+
+    def write_word24(self, addr24, value):
+        """ Write a word at a 24-bit bank:address value. """
+        self.write_word(addr24 >> 16, addr24 & 0xFFFF, value)
+
     def decode(self, bank, address):
-        """ Returns object/offset/writable for the given bank/address pair. """
+        """ Returns object/offset/writable for the given bank/address pair.
+
+        The object is the flat backing buffer for storage-backed space, the
+        MMIO dispatcher for register space, or None for unmapped space.
+        """
         masked_bank = bank & 0x7F
         if masked_bank < 0x40: # 0x00-0x3F,0x80-0xBF
             if address < 0x2000:
-                return self.low_ram, address, True
+                return self._flat, LOW_RAM_BASE + address, True
             elif address < 0x8000:
                 return self.mmio, address, True
             else:
-                return self.lo_rom, (masked_bank * 0x8000) + (address & 0x7FFF), False
+                return self._flat, ROM_BASE + (masked_bank * 0x8000) + (address & 0x7FFF), False
         elif masked_bank < 0x70: # 0x40-0x6F,0xC0-0xEF
             if address < 0x8000:
                 return None, 0, True
             else:
-                return self.lo_rom, (masked_bank * 0x8000) + (address & 0x7FFF), False
+                return self._flat, ROM_BASE + (masked_bank * 0x8000) + (address & 0x7FFF), False
         elif 0x70 <= masked_bank <= 0x7D: # 0x70-0x7D,0xF0-0xFD
             if address < 0x8000:
                 # Max 32k, repeated in each bank.
-                return self.cartridge_sram, address, True
+                return self._flat, SRAM_BASE + address, True
             else:
-                return self.lo_rom, (masked_bank * 0x8000) + (address & 0x7FFF), False
-                
+                return self._flat, ROM_BASE + (masked_bank * 0x8000) + (address & 0x7FFF), False
+
         elif bank == 0x7E: # NOTE: not masked
             if address < 0x2000:
-                return self.low_ram, address, True
+                return self._flat, LOW_RAM_BASE + address, True
             elif address < 0x8000:
-                return self.high_ram, address - 0x2000, True
+                return self._flat, HIGH_RAM_BASE + (address - 0x2000), True
             else:
-                return self.extended_ram, address - 0x8000, True
-                
+                return self._flat, EXT_RAM_BASE + (address - 0x8000), True
+
         elif bank == 0x7F: # NOTE: not masked
-            return self.extended_ram, address + 0x8000, True
-            
+            return self._flat, EXT_RAM_BASE + address + 0x8000, True
+
         elif bank == 0xFE or bank == 0xFF: # NOTE: not masked
             if address < 0x8000:
                 # Max 32k, repeated in each bank.
-                return self.cartridge_sram, address, True
+                return self._flat, SRAM_BASE + address, True
             else:
-                return self.lo_rom, (masked_bank * 0x8000) + (address & 0x7FFF), False
-                
-    def read_byte(self, bank, address):
-        """ Read a byte from the given bank/address pair. """
-        memory, offset, _writable = self.decode(bank, address)
-        # log.debug("read_byte(%02x:%04x) -> %d, %r", bank, address, offset, writable)
-        return memory[offset]
-        
+                return self._flat, ROM_BASE + (masked_bank * 0x8000) + (address & 0x7FFF), False
+
     def read_word(self, bank, address):
         """ Read a word from the given bank/address pair. """
-        memory, offset, _writable = self.decode(bank, address)
-        # log.debug("read_word(%02x:%04x) -> %d, %r", bank, address, offset, writable)
-        return memory[offset + 1] << 8 | memory[offset]
-        
-    def write_byte(self, bank, address, value):
-        """ Write a byte to the given bank/address pair. """
-        memory, offset, writable = self.decode(bank, address)
-        # log.debug("write_byte(%02x:%04x) -> %d, %r", bank, address, offset, writable)
-        if writable:
-            memory[offset] = value
-        
+        low = address & PAGE_MASK
+        if low == PAGE_MASK:
+            # The word straddles an 8K page boundary, where adjacent pages
+            # need not be adjacent in the flat buffer; decode each half.
+            return self.read_byte(bank, address) | \
+                   self.read_byte(bank, (address + 1) & 0xFFFF) << 8
+        offset = self._read_off[(bank << 3) | (address >> PAGE_SHIFT)]
+        if offset >= 0:
+            # One C-level unaligned 16-bit load instead of two subscripts
+            # plus a shift/or.
+            return _unpack_u16(self._flat, offset + low)[0]
+        if offset == MMIO_PAGE:
+            return self.mmio[address + 1] << 8 | self.mmio[address]
+        log.warning("Read from unmapped memory %02x:%04x, returning 0", bank, address)
+        return 0
+
+    def read_block(self, bank, address, count, dst):
+        """ Read count bytes starting at bank/address into dst.
+
+        Bulk counterpart of read_byte for PPU/DMA-style transfers: fills the
+        first count bytes of dst, a bytearray or writable memoryview.
+        Buffer-backed pages land as slice assignments, a C-level memcpy per
+        8K page, instead of count Python-level subscripts; MMIO and unmapped
+        pages fall back to the byte accessor. The source address wraps
+        within its bank.
+        """
+        flat = self._flat
+        read_off = self._read_off
+        read_byte = self.read_byte
+        dst_index = 0
+        while count:
+            low = address & PAGE_MASK
+            chunk = min(count, 0x2000 - low)
+            offset = read_off[(bank << 3) | (address >> PAGE_SHIFT)]
+            if offset >= 0:
+                offset += low
+                dst[dst_index:dst_index + chunk] = flat[offset:offset + chunk]
+            else:
+                for index in range(chunk):
+                    dst[dst_index + index] = read_byte(bank, (address + index) & 0xFFFF)
+            dst_index += chunk
+            address = (address + chunk) & 0xFFFF
+            count -= chunk
+
+    def copy_block(self, src_bank, src_address, dst_bank, dst_address, count):
+        """ Copy count bytes from one bank/address range to another.
+
+        Intended for block moves (MVN/MVP) and DMA-style transfers, where a
+        per-byte loop through read_byte/write_byte would dominate. Runs of
+        buffer-backed pages copy via slice assignment, a C-level memcpy,
+        splitting on 8K page boundaries; pages needing MMIO or unmapped
+        handling fall back to the byte accessors. Addresses wrap within
+        their bank like the block-move opcodes do.
+        """
+        flat = self._flat
+        read_off = self._read_off
+        write_off = self._write_off
+        while count:
+            src_low = src_address & PAGE_MASK
+            dst_low = dst_address & PAGE_MASK
+            chunk = min(count, 0x2000 - src_low, 0x2000 - dst_low)
+            src_off = read_off[(src_bank << 3) | (src_address >> PAGE_SHIFT)]
+            dst_off = write_off[(dst_bank << 3) | (dst_address >> PAGE_SHIFT)]
+            if src_off >= 0 and dst_off >= 0:
+                src_off += src_low
+                dst_off += dst_low
+                # Slicing the source copies it first, so overlapping ranges
+                # behave like memmove.
+                flat[dst_off:dst_off + chunk] = flat[src_off:src_off + chunk]
+            else:
+                for index in range(chunk):
+                    self.write_byte(dst_bank, (dst_address + index) & 0xFFFF,
+                                    self.read_byte(src_bank, (src_address + index) & 0xFFFF))
+            src_address = (src_address + chunk) & 0xFFFF
+            dst_address = (dst_address + chunk) & 0xFFFF
+            count -= chunk
+
     def write_word(self, bank, address, value):
         """ Write a word to the given bank/address pair. """
-        memory, offset, writable = self.decode(bank, address)
-        # log.debug("write_word(%02x:%04x) -> %d, %r", bank, address, offset, writable)
-        if writable:
-            memory[offset] = value & 0xFF
-            memory[offset + 1] = value >> 8
-            
-        
\ No newline at end of file
+        low = address & PAGE_MASK
+        if low == PAGE_MASK:
+            self.write_byte(bank, address, value & 0xFF)
+            self.write_byte(bank, (address + 1) & 0xFFFF, value >> 8)
+            return
+        offset = self._write_off[(bank << 3) | (address >> PAGE_SHIFT)]
+        if offset >= 0:
+            _pack_u16(self._flat, offset + low, value)
+        elif offset == MMIO_PAGE:
+            self.mmio[address] = value & 0xFF
+            self.mmio[address + 1] = value >> 8
+        elif offset == UNMAPPED_PAGE:
+            log.warning("Write to unmapped memory %02x:%04x ignored (0x%04x)", bank, address, value)
@@ -19,6 +19,10 @@ APU_STATUS = 0x2140 # Byte
 APU_DATA = 0x2141 # Byte
 APU_ADDRESS = 0x2142 # Word
 
+# The memory map routes 0x2000-0x7FFF here.
+MMIO_BASE = 0x2000
+MMIO_SIZE = 0x6000
+
 # Functions
 
 # Classes
@@ -26,22 +30,29 @@ class MMIO(object):
     """ Mock memory mapped I/O bank for MySNES. """
     def __init__(self):
         self.apu = APU()
-        self.map = {
-            APU_STATUS : (self.apu.read_status, self.apu.write_status),
-            APU_DATA : (self.apu.read_data, self.apu.write_data),
-        }
+
+        # Flat handler tables indexed by (address - MMIO_BASE): the register
+        # space is dense, so a list subscript beats hashing the address and
+        # unpacking a handler tuple on every access.  None marks registers
+        # nothing has claimed yet.
+        self._read = [None] * MMIO_SIZE
+        self._write = [None] * MMIO_SIZE
+        self._read[APU_STATUS - MMIO_BASE] = self.apu.read_status
+        self._write[APU_STATUS - MMIO_BASE] = self.apu.write_status
+        self._read[APU_DATA - MMIO_BASE] = self.apu.read_data
+        self._write[APU_DATA - MMIO_BASE] = self.apu.write_data
+
     def __getitem__(self, address):
-        handlers = self.map.get(address, None)
-        if handlers:
-            return handlers[0]()
-        else:
-            log.warning("Unhandled MMIO read 0x%04x, returning 0", address)
-            return 0
+        handler = self._read[address - MMIO_BASE]
+        if handler is not None:
+            return handler()
+        log.warning("Unhandled MMIO read 0x%04x, returning 0", address)
+        return 0
         
     def __setitem__(self, address, value):
-        handlers = self.map.get(address, None)
-        if handlers:
-            handlers[1](value)
+        handler = self._write[address - MMIO_BASE]
+        if handler is not None:
+            handler(value)
         else:
             log.warning("Unhandled MMIO write 0x%04x -> 0x%02x", address, value)
         
\ No newline at end of file
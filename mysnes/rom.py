@@ -5,6 +5,7 @@ https://en.wikibooks.org/wiki/Super_NES_Programming/SNES_memory_map#The_SNES_hea
 """
 
 # Standard library imports
+import mmap
 
 # Six imports
 import six
@@ -38,9 +39,14 @@ class RomImage(object):
     def __init__(self, filepath):
         self.type = None
         
+        # Map the file read-only instead of read()ing it: no startup copy of
+        # a multi-megabyte image, and the OS page cache backs the data.  The
+        # mapping stays valid after the file object is closed, and the
+        # memoryview on top makes the slices below O(1) windows rather than
+        # multi-megabyte copies.
         with open(filepath, "rb") as fileptr:
-            self.data = fileptr.read()
-            
+            self.data = memoryview(mmap.mmap(fileptr.fileno(), 0, access=mmap.ACCESS_READ))
+
         # Determine if header present.
         if len(self.data) & 0x3FF == 512:
             self.header = self.data[0:512]
@@ -58,12 +64,16 @@ class RomImage(object):
         lo_rom_type = six.indexbytes(self.data, LO_ROM_HEADER + ROM_TYPE_OFFSET)
         if lo_rom_type in RomType.VALID_TYPES:
             self.type = lo_rom_type
-        else:
+        elif len(self.data) > HI_ROM_HEADER + ROM_TYPE_OFFSET:
             hi_rom_type = six.indexbytes(self.data, HI_ROM_HEADER + ROM_TYPE_OFFSET)
             if hi_rom_type in RomType.VALID_TYPES:
                 self.type = hi_rom_type
             else:
                 raise ValueError("Unable to determine cartridge type!")
-                
-        log.debug("Header info: %r", self.data[0x7FC0 : 0x8000])
+
+        # Image too small to even hold a HiROM header.
+        else:
+            raise ValueError("Unable to determine cartridge type!")
+
+        log.debug("Header info: %r", self.data[0x7FC0 : 0x8000].tobytes())
         
\ No newline at end of file